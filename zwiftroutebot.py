@@ -22,24 +22,40 @@ Last Updated: March 24, 2025
 # ==========================================
 import discord
 from discord import app_commands
-import json
+import orjson
 import os
 from dotenv import load_dotenv
 import aiohttp
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from difflib import get_close_matches
 import random
 import asyncio
-from discord.errors import HTTPException
 import time
-from collections import deque
+from collections import OrderedDict, Counter
 import logging
-from urllib.parse import quote
 import io  # For handling file data in memory
 import re  # For pattern matching in route details
 import datetime  # For timestamp formatting
+import tempfile
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal, Optional, List, Dict, Tuple, Any, Union
 
+# RapidFuzz is preferred for fuzzy matching; difflib is the fallback
+try:
+    from rapidfuzz import process, fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# uvloop is a faster drop-in event loop where available (not on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # ==========================================
 # Configure Logging
 # ==========================================
@@ -49,6 +65,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+if not RAPIDFUZZ_AVAILABLE:
+    logger.warning("rapidfuzz is not installed; fuzzy matching will fall back to the much slower difflib")
+
 # ==========================================
 # Load Environment Variables and Data Files
 # ==========================================
@@ -58,6 +77,27 @@ TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 # Admin configuration
 ADMIN_IDS = [837025118613798945]  # Your admin ID is hardcoded here
 
+# Route image locations, tried in order (Docker, relative, local development)
+IMAGE_BASE_PATHS = (
+    "/app/route_images",
+    "route_images",
+    "/home/micah-reeves/Desktop/zwift-route-bot/route_images"
+)
+
+# Image types to look for and the subdirectory each lives in
+IMAGE_TYPES = {
+    "Profile": "profiles",
+    "Incline": "inclines",
+    "Map": "maps"
+}
+
+# Lowercase extensions of the image files that can be attached to a response
+IMAGE_EXTENSIONS = ('.png', '.webp')
+
+# Shared embed styling
+EMBED_COLOR = 0xFC6719  # Zwift orange
+EMBED_THUMBNAIL_URL = "https://zwiftinsider.com/wp-content/uploads/2022/12/zwift-logo.png"
+
 
 # Global variables
 zwift_routes = []
@@ -71,14 +111,14 @@ def load_json_file(file_path, default_value=None):
         default_value = []
     
     try:
-        with open(file_path, "r", encoding='utf-8') as file:
-            data = json.load(file)
+        with open(file_path, "rb") as file:
+            data = orjson.loads(file.read())
         logger.info(f"Successfully loaded {file_path} with {len(data)} items")
         return data
     except FileNotFoundError:
         logger.error(f"File not found: {file_path}")
         return default_value
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.error(f"Invalid JSON in file: {file_path}")
         return default_value
     except Exception as e:
@@ -94,9 +134,17 @@ zwift_sprints = load_json_file("zwift_sprint_segments.json")
 # Core Utility Functions
 # ==========================================
 
+# Translation table that deletes every ASCII character except letters and digits
+ALNUM_ONLY_TABLE = str.maketrans('', '', ''.join(chr(i) for i in range(128) if not chr(i).isalnum()))
+
+# Translation table that deletes every ASCII character except letters, digits and whitespace
+NORMALIZE_TABLE = str.maketrans('', '', ''.join(chr(i) for i in range(128) if not (chr(i).isalnum() or chr(i).isspace())))
+
+@lru_cache(maxsize=4096)
 def normalize_route_name(name):
     """
     Remove special characters and standardize the name for matching purposes.
+    Results are cached, as users tend to repeat the same queries.
     
     Args:
         name: The route name to normalize
@@ -104,8 +152,28 @@ def normalize_route_name(name):
     Returns:
         Normalized string with only alphanumeric characters and spaces
     """
+    if name.isascii():
+        return name.lower().translate(NORMALIZE_TABLE)
+    # Non-ASCII input (rare, only from user queries) takes the per-character path
     return ''.join(c.lower() for c in name if c.isalnum() or c.isspace())
 
+# Name patterns identifying each non-Watopia world, checked in order,
+# with each world's patterns compiled into a single alternation
+WORLD_PATTERNS = {
+    world: re.compile('|'.join(re.escape(pattern) for pattern in patterns))
+    for world, patterns in {
+        'Makuri': ['makuri', 'neokyo', 'urukazi', 'castle', 'temple', 'rooftop'],
+        'France': ['france', 'ven-top', 'casse-pattes', 'petit', 'ventoux'],
+        'London': ['london', 'greater london', 'london loop', 'leith', 'box hill', 'surrey'],
+        'Yorkshire': ['yorkshire', 'harrogate', 'royal pump'],
+        'Innsbruck': ['innsbruck', 'lutscher'],
+        'Richmond': ['richmond'],
+        'Paris': ['paris', 'champs', 'lutece'],
+        'Scotland': ['glasgow', 'scotland', 'sgurr', 'loch'],
+        'New York': ['new york', 'ny', 'central park', 'astoria'],
+    }.items()
+}
+
 def get_world_for_route(route_name):
     """
     Determine the Zwift world for a given route based on name patterns.
@@ -118,27 +186,148 @@ def get_world_for_route(route_name):
     """
     route_lower = route_name.lower()
     
-    # Define world mappings with specific patterns
-    world_patterns = {
-        'Makuri': ['makuri', 'neokyo', 'urukazi', 'castle', 'temple', 'rooftop'],
-        'France': ['france', 'ven-top', 'casse-pattes', 'petit', 'ventoux'],
-        'London': ['london', 'greater london', 'london loop', 'leith', 'box hill', 'surrey'],
-        'Yorkshire': ['yorkshire', 'harrogate', 'royal pump'],
-        'Innsbruck': ['innsbruck', 'lutscher'],
-        'Richmond': ['richmond'],
-        'Paris': ['paris', 'champs', 'lutece'],
-        'Scotland': ['glasgow', 'scotland', 'sgurr', 'loch'],
-        'New York': ['new york', 'ny', 'central park', 'astoria'],
-    }
-    
     # Check each world's patterns
-    for world, patterns in world_patterns.items():
-        if any(pattern in route_lower for pattern in patterns):
+    for world, pattern in WORLD_PATTERNS.items():
+        if pattern.search(route_lower):
             return world
             
     # Default to Watopia if no other world matches
     return 'Watopia'
 
+@lru_cache(maxsize=64)
+def load_image_bytes(image_path):
+    """
+    Read an image file, keeping the most recently sent images in memory.
+    
+    Args:
+        image_path: Path to the image file
+        
+    Returns:
+        bytes: The file contents
+    """
+    with open(image_path, 'rb') as f:
+        return f.read()
+
+def get_cyccal_url(route_name):
+    """
+    Build the Cyccal page URL for a route.
+    
+    Args:
+        route_name: The official name of the route
+        
+    Returns:
+        The Cyccal URL for the route
+    """
+    return f"https://cyccal.com/{route_name.lower().replace(' ', '-')}/"
+
+def get_bigrams(text):
+    """
+    Split a string into its set of overlapping two-character grams.
+    
+    Args:
+        text: The (normalized) string to split
+        
+    Returns:
+        set: All two-character substrings of the text
+    """
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+def build_bigram_index(names):
+    """
+    Build an inverted index from bigram to the positions of the names containing it.
+    
+    Args:
+        names: List of normalized names
+        
+    Returns:
+        dict: Mapping of bigram -> set of indices into names
+    """
+    index = {}
+    for i, name in enumerate(names):
+        for bigram in get_bigrams(name):
+            index.setdefault(bigram, set()).add(i)
+    return index
+
+def find_substring_positions(query, names, bigram_index):
+    """
+    Find the names that contain a query, using a bigram index to narrow the scan.
+    A name can only contain the query if it has every one of the query's bigrams,
+    so only names found in all of their posting sets are checked.
+    
+    Args:
+        query: The normalized string to look for
+        names: List of normalized names
+        bigram_index: Index of the names built by build_bigram_index
+        
+    Returns:
+        list: Positions into names, in ascending order
+    """
+    query_bigrams = get_bigrams(query)
+    if query_bigrams:
+        postings = sorted((bigram_index.get(bigram, set()) for bigram in query_bigrams), key=len)
+        candidate_ids = sorted(set.intersection(*postings))
+    else:
+        candidate_ids = range(len(names))
+    return [i for i in candidate_ids if query in names[i]]
+
+def get_close_match_positions(query, choices, limit=3, cutoff=60):
+    """
+    Find the choices most similar to a query, ranked by difflib's ratio.
+    When RapidFuzz is available it first discards the choices that cannot
+    reach the cutoff: its Indel ratio is never below difflib's, so only the
+    few choices that survive need the slower difflib scoring.
+    
+    Args:
+        query: The string to match
+        choices: Candidate strings
+        limit: Maximum number of matches to return
+        cutoff: Minimum similarity score (0-100) for a match
+        
+    Returns:
+        list: Positions into choices, best match first
+    """
+    candidates = choices
+    if RAPIDFUZZ_AVAILABLE:
+        results = process.extract(query, choices, scorer=fuzz.ratio, limit=None, score_cutoff=cutoff)
+        candidates = [choice for choice, _, _ in results]
+    
+    close_matches = get_close_matches(query, candidates, n=limit, cutoff=cutoff / 100)
+    return [choices.index(match) for match in close_matches]
+
+# ==========================================
+# Precomputed Route Data
+# ==========================================
+# Values derived purely from the static data files are computed once
+# here so command handlers only have to look them up.
+
+for route in zwift_routes:
+    route["_cyccal_url"] = get_cyccal_url(route["Route"])
+    route["_display"] = f"• {route['Route']}"  # Bullet line used in route lists
+
+# Normalized route names and the bigram index used to narrow substring matching
+zwift_routes_normalized = [normalize_route_name(r["Route"]) for r in zwift_routes]
+route_bigram_index = build_bigram_index(zwift_routes_normalized)
+
+# Exact-match lookups by normalized name (first entry wins, as with a linear scan)
+route_by_norm = {}
+for norm, route in zip(zwift_routes_normalized, zwift_routes):
+    route_by_norm.setdefault(norm, route)
+
+zwift_koms_normalized = [normalize_route_name(k["Segment"]) for k in zwift_koms]
+kom_bigram_index = build_bigram_index(zwift_koms_normalized)
+kom_by_norm = {}
+for norm, kom in zip(zwift_koms_normalized, zwift_koms):
+    kom_by_norm.setdefault(norm, kom)
+
+zwift_sprints_normalized = [normalize_route_name(s["Segment"]) for s in zwift_sprints]
+sprint_bigram_index = build_bigram_index(zwift_sprints_normalized)
+sprint_by_norm = {}
+for norm, sprint in zip(zwift_sprints_normalized, zwift_sprints):
+    sprint_by_norm.setdefault(norm, sprint)
+
+# Number of random routes suggested when a search finds nothing
+ROUTE_SUGGESTION_COUNT = min(3, len(zwift_routes))
+
 # ==========================================
 # User Interface Helpers
 # ==========================================
@@ -166,31 +355,38 @@ def find_route(search_term):
     if not search_term or not zwift_routes:
         return None, []
     
-    search_term = normalize_route_name(search_term)
+    route, alternatives = find_route_normalized(normalize_route_name(search_term))
+    return route, list(alternatives)
+
+@lru_cache(maxsize=1024)
+def find_route_normalized(search_term):
+    """
+    Find a route by its normalized search term. Results are cached, as the
+    route data does not change while the bot is running.
     
+    Args:
+        search_term: The normalized search query
+        
+    Returns:
+        tuple: (matched_route, alternative_routes) with alternatives as a tuple
+    """
     # Check for exact match first
-    for route in zwift_routes:
-        if normalize_route_name(route["Route"]) == search_term:
-            return route, []
+    exact = route_by_norm.get(search_term)
+    if exact:
+        return exact, ()
             
     # Check for partial matches
-    matches = []
-    for route in zwift_routes:
-        if search_term in normalize_route_name(route["Route"]):
-            matches.append(route)
+    matches = [zwift_routes[i] for i in find_substring_positions(search_term, zwift_routes_normalized, route_bigram_index)]
     if matches:
-        return matches[0], matches[1:3]
+        return matches[0], tuple(matches[1:3])
         
     # Try fuzzy matching if no direct matches found
-    route_names = [normalize_route_name(r["Route"]) for r in zwift_routes]
-    close_matches = get_close_matches(search_term, route_names, n=3, cutoff=0.6)
-    if close_matches:
-        matched_routes = [r for r in zwift_routes if normalize_route_name(r["Route"]) == close_matches[0]]
-        alternative_routes = [r for r in zwift_routes if normalize_route_name(r["Route"]) in close_matches[1:]]
-        if matched_routes:
-            return matched_routes[0], alternative_routes
+    positions = get_close_match_positions(search_term, zwift_routes_normalized)
+    if positions:
+        matched_routes = [zwift_routes[position] for position in positions]
+        return matched_routes[0], tuple(matched_routes[1:])
     
-    return None, []
+    return None, ()
 
 def find_sprint(search_term):
     """
@@ -209,26 +405,20 @@ def find_sprint(search_term):
     normalized_search = normalize_route_name(search_term)
     
     # Check for exact match first
-    for sprint in zwift_sprints:
-        if normalize_route_name(sprint["Segment"]) == normalized_search:
-            return sprint, []
+    exact = sprint_by_norm.get(normalized_search)
+    if exact:
+        return exact, []
             
     # Check for partial matches
-    matches = []
-    for sprint in zwift_sprints:
-        if normalized_search in normalize_route_name(sprint["Segment"]):
-            matches.append(sprint)
+    matches = [zwift_sprints[i] for i in find_substring_positions(normalized_search, zwift_sprints_normalized, sprint_bigram_index)]
     if matches:
         return matches[0], matches[1:3]
         
     # Try fuzzy matching if no direct matches found
-    sprint_names = [normalize_route_name(s["Segment"]) for s in zwift_sprints]
-    close_matches = get_close_matches(normalized_search, sprint_names, n=3, cutoff=0.6)
-    if close_matches:
-        matched_sprints = [s for s in zwift_sprints if normalize_route_name(s["Segment"]) == close_matches[0]]
-        alternative_sprints = [s for s in zwift_sprints if normalize_route_name(s["Segment"]) in close_matches[1:]]
-        if matched_sprints:
-            return matched_sprints[0], alternative_sprints
+    positions = get_close_match_positions(normalized_search, zwift_sprints_normalized)
+    if positions:
+        matched_sprints = [zwift_sprints[position] for position in positions]
+        return matched_sprints[0], matched_sprints[1:]
     
     return None, []
 
@@ -250,36 +440,38 @@ def find_kom(search_term):
     normalized_search = normalize_route_name(search_term)
     
     # Check for exact match first
-    for kom in zwift_koms:
-        if normalize_route_name(kom["Segment"]) == normalized_search:
-            return kom, []
+    exact = kom_by_norm.get(normalized_search)
+    if exact:
+        return exact, []
             
     # Check for partial matches
-    matches = []
-    for kom in zwift_koms:
-        if normalized_search in normalize_route_name(kom["Segment"]):
-            matches.append(kom)
+    matches = [zwift_koms[i] for i in find_substring_positions(normalized_search, zwift_koms_normalized, kom_bigram_index)]
     if matches:
         return matches[0], matches[1:3]
         
     # Try fuzzy matching if no direct matches found
-    kom_names = [normalize_route_name(k["Segment"]) for k in zwift_koms]
-    close_matches = get_close_matches(normalized_search, kom_names, n=3, cutoff=0.6)
-    if close_matches:
-        matched_koms = [k for k in zwift_koms if normalize_route_name(k["Segment"]) == close_matches[0]]
-        alternative_koms = [k for k in zwift_koms if normalize_route_name(k["Segment"]) in close_matches[1:]]
-        if matched_koms:
-            return matched_koms[0], alternative_koms
+    positions = get_close_match_positions(normalized_search, zwift_koms_normalized)
+    if positions:
+        matched_koms = [zwift_koms[position] for position in positions]
+        return matched_koms[0], matched_koms[1:]
     
     return None, []
 # ==========================================
 # Route Information Fetching
 # ==========================================
-async def fetch_route_info(url):
+
+# Matches the stat labels ZwiftInsider uses in its route summary paragraphs
+STATS_PATTERN = re.compile(r'(distance|elevation|length|climb)\s*:', re.IGNORECASE)
+
+# Only paragraphs (stats) and images (route image) are needed from a route page
+ROUTE_INFO_STRAINER = SoupStrainer(['p', 'img'])
+
+async def fetch_route_info(session, url):
     """
     Fetch route information from ZwiftInsider.
     
     Args:
+        session: The shared aiohttp session to make the request with
         url: The URL of the route page
         
     Returns:
@@ -288,19 +480,20 @@ async def fetch_route_info(url):
             image_url: URL to route image if found
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    stats = []
-                    for p in soup.find_all('p'):
-                        text = p.get_text()
-                        if any(key in text.lower() for key in ['distance:', 'elevation:', 'length:', 'climb:']):
-                            stats.append(text.strip())
-                    img = soup.find('img', class_='wp-post-image')
-                    img_url = img['src'] if img else None
-                    return stats[:3], img_url
+        async with session.get(url, timeout=10) as response:
+            if response.status == 200:
+                html = await response.text()
+                soup = BeautifulSoup(html, 'lxml', parse_only=ROUTE_INFO_STRAINER)
+                stats = []
+                for p in soup.find_all('p'):
+                    text = p.get_text()
+                    if STATS_PATTERN.search(text):
+                        stats.append(text.strip())
+                        if len(stats) == 3:
+                            break
+                img = soup.find('img', class_='wp-post-image')
+                img_url = img['src'] if img else None
+                return stats[:3], img_url
     except Exception as e:
         logger.error(f"Error fetching route info: {e}")
     return [], None
@@ -318,6 +511,22 @@ async def fetch_route_info(url):
 # Fetches and stores detailed route information to provide
 # enhanced functionality and improve response times.
 
+# Patterns used to pull route details out of ZwiftInsider pages, compiled once
+ZWIFT_INSIDER_LEAD_IN_PATTERN = re.compile(r'\*\+\s*(\d+\.?\d*)\s*km.*?\((\d+\.?\d*)\s*miles\).*?lead-in.*?(\d+)m\s*\((\d+)[\'"]', re.IGNORECASE)
+ALT_LEAD_IN_PATTERN = re.compile(r'\+\s*(\d+\.?\d*)\s*km.*?(\d+)m\s*\((\d+)[\'"]', re.IGNORECASE)
+DISTANCE_KM_PATTERN = re.compile(r'(?:distance|length):\s*(\d+\.?\d*)\s*km', re.IGNORECASE)
+DISTANCE_MILES_PATTERN = re.compile(r'(?:distance|length):[^(]*\(\s*(\d+\.?\d*)\s*(?:mi|miles)\)', re.IGNORECASE)
+ELEVATION_M_PATTERN = re.compile(r'(?:elevation|climbing):\s*(\d+\.?\d*)\s*(?:m|meters)\b', re.IGNORECASE)
+ELEVATION_FT_PATTERN = re.compile(r'(?:elevation|climbing):[^(]*\(\s*(\d+\.?\d*)\s*(?:ft|feet|\')\)', re.IGNORECASE)
+LEAD_IN_PATTERNS = (
+    re.compile(r'(?:lead-in|lead in):\s*(\d+\.?\d*)\s*km', re.IGNORECASE),  # Basic pattern
+    re.compile(r'\+\s*(\d+\.?\d*)\s*km\s*(?:lead-in|lead in)', re.IGNORECASE),  # Format with + sign
+    re.compile(r'\*\+(\d+\.?\d*)\s*km.*?lead-in\*', re.IGNORECASE),  # Markdown format
+    re.compile(r'lead-in\s*(?:with|of)?\s*(\d+\.?\d*)\s*km', re.IGNORECASE)  # Descriptive format
+)
+LEAD_IN_ELEVATION_PATTERN = re.compile(r'lead-in.*?(\d+)m\s*\((\d+)(?:\'|ft)', re.IGNORECASE)
+WKG_TIME_PATTERN = re.compile(r'(\d+)\s*W/kg:\s*(\d+)\s*minutes')
+
 class RouteCache:
     """
     Cache system for storing route details.
@@ -355,8 +564,8 @@ class RouteCache:
                 # Check if cache is recent
                 cache_age = time.time() - os.path.getmtime(self.CACHE_FILE)
                 if cache_age < self.CACHE_AGE_DAYS * 24 * 60 * 60:
-                    with open(self.CACHE_FILE, 'r', encoding='utf-8') as f:
-                        route_cache = json.load(f)
+                    with open(self.CACHE_FILE, 'rb') as f:
+                        route_cache = orjson.loads(f.read())
                         logger.info(f"Loaded cache with {len(route_cache)} routes")
                         return route_cache
                 else:
@@ -368,9 +577,7 @@ class RouteCache:
             return await self.cache_route_details()
             
         except Exception as e:
-            logger.error(f"Error loading route cache: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error loading route cache: {e}")
             return {}
     
     async def cache_route_details(self):
@@ -420,13 +627,11 @@ class RouteCache:
         
         # Save cache to file
         try:
-            with open(self.CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(route_cache, f, indent=2)
+            with open(self.CACHE_FILE, 'wb') as f:
+                f.write(orjson.dumps(route_cache, option=orjson.OPT_INDENT_2))
             logger.info(f"Successfully cached details for {len(route_cache)} routes")
         except Exception as e:
-            logger.error(f"Error saving route cache: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error saving route cache: {e}")
         
         return route_cache
     
@@ -453,7 +658,7 @@ class RouteCache:
                     return None
                 
                 html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = BeautifulSoup(html, 'lxml')
                 
                 # Extract relevant information
                 route_data = {
@@ -472,7 +677,7 @@ class RouteCache:
                 
                 # Check for ZwiftInsider's specific lead-in format in the entire page content
                 # This pattern matches formats like: *+7.6km (4.7 miles) lead-in with 59m (194') elevation*
-                zwift_insider_lead_in = re.search(r'\*\+\s*(\d+\.?\d*)\s*km.*?\((\d+\.?\d*)\s*miles\).*?lead-in.*?(\d+)m\s*\((\d+)[\'"]', html, re.IGNORECASE)
+                zwift_insider_lead_in = ZWIFT_INSIDER_LEAD_IN_PATTERN.search(html)
                 
                 if zwift_insider_lead_in:
                     route_data['lead_in_km'] = float(zwift_insider_lead_in.group(1))
@@ -483,7 +688,7 @@ class RouteCache:
                 
                 # Alternative lead-in pattern that appears in some routes
                 if 'lead_in_km' not in route_data:
-                    alt_lead_in = re.search(r'\+\s*(\d+\.?\d*)\s*km.*?(\d+)m\s*\((\d+)[\'"]', html, re.IGNORECASE)
+                    alt_lead_in = ALT_LEAD_IN_PATTERN.search(html)
                     if alt_lead_in:
                         route_data['lead_in_km'] = float(alt_lead_in.group(1))
                         route_data['lead_in_miles'] = round(float(alt_lead_in.group(1)) * 0.621371, 1)
@@ -498,13 +703,13 @@ class RouteCache:
                     # Check for distance information first - be more specific with pattern
                     if 'distance:' in text or 'length:' in text:
                         # Extract kilometers value
-                        km_match = re.search(r'(?:distance|length):\s*(\d+\.?\d*)\s*km', text, re.IGNORECASE)
+                        km_match = DISTANCE_KM_PATTERN.search(text)
                         if km_match:
                             distance_km = float(km_match.group(1))
                             logger.info(f"Found distance: {distance_km} km")
                         
                         # Extract miles value - look specifically for parenthetical pattern
-                        miles_match = re.search(r'(?:distance|length):[^(]*\(\s*(\d+\.?\d*)\s*(?:mi|miles)\)', text, re.IGNORECASE)
+                        miles_match = DISTANCE_MILES_PATTERN.search(text)
                         if miles_match:
                             distance_miles = float(miles_match.group(1))
                             logger.info(f"Found distance: {distance_miles} miles")
@@ -520,13 +725,13 @@ class RouteCache:
                     # Now check for elevation - after distance to avoid confusion
                     if 'elevation:' in text or 'climbing:' in text:
                         # Extract meters value - explicitly look for 'm' unit
-                        m_match = re.search(r'(?:elevation|climbing):\s*(\d+\.?\d*)\s*(?:m|meters)\b', text, re.IGNORECASE)
+                        m_match = ELEVATION_M_PATTERN.search(text)
                         if m_match:
                             elevation_m = float(m_match.group(1))
                             logger.info(f"Found elevation: {elevation_m} m")
                         
                         # Extract feet value - look for ft unit or measurement symbol
-                        ft_match = re.search(r'(?:elevation|climbing):[^(]*\(\s*(\d+\.?\d*)\s*(?:ft|feet|\')\)', text, re.IGNORECASE)
+                        ft_match = ELEVATION_FT_PATTERN.search(text)
                         if ft_match:
                             elevation_ft = float(ft_match.group(1))
                             logger.info(f"Found elevation: {elevation_ft} feet")
@@ -541,15 +746,8 @@ class RouteCache:
                     
                     # Check for lead-in information with improved patterns if not already found
                     if 'lead_in_km' not in route_data:
-                        lead_in_patterns = [
-                            r'(?:lead-in|lead in):\s*(\d+\.?\d*)\s*km',  # Basic pattern
-                            r'\+\s*(\d+\.?\d*)\s*km\s*(?:lead-in|lead in)',  # Format with + sign
-                            r'\*\+(\d+\.?\d*)\s*km.*?lead-in\*',  # Markdown format 
-                            r'lead-in\s*(?:with|of)?\s*(\d+\.?\d*)\s*km'  # Descriptive format
-                        ]
-                        
-                        for pattern in lead_in_patterns:
-                            lead_in_match = re.search(pattern, text, re.IGNORECASE)
+                        for pattern in LEAD_IN_PATTERNS:
+                            lead_in_match = pattern.search(text)
                             if lead_in_match:
                                 lead_in_km = float(lead_in_match.group(1))
                                 logger.info(f"Found lead-in: {lead_in_km} km")
@@ -557,7 +755,7 @@ class RouteCache:
                                 route_data['lead_in_miles'] = round(lead_in_km * 0.621371, 1)
                                 
                                 # Try to extract lead-in elevation if available
-                                lead_in_elev_match = re.search(r'lead-in.*?(\d+)m\s*\((\d+)(?:\'|ft)', text, re.IGNORECASE)
+                                lead_in_elev_match = LEAD_IN_ELEVATION_PATTERN.search(text)
                                 if lead_in_elev_match:
                                     route_data['lead_in_elevation_m'] = float(lead_in_elev_match.group(1))
                                     route_data['lead_in_elevation_ft'] = float(lead_in_elev_match.group(2))
@@ -604,7 +802,7 @@ class RouteCache:
                         logger.info(f"Found potential time estimates text: {text[:100]}...")
                         
                         # Extract all wattage-based estimates
-                        wkg_matches = re.findall(r'(\d+)\s*W/kg:\s*(\d+)\s*minutes', text)
+                        wkg_matches = WKG_TIME_PATTERN.findall(text)
                         
                         if wkg_matches:
                             for wkg, minutes in wkg_matches:
@@ -682,9 +880,7 @@ class RouteCache:
                 return route_data
                 
         except Exception as e:
-            logger.error(f"Error in fetch_route_details for {route.get('Route', 'unknown')}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error in fetch_route_details for {route.get('Route', 'unknown')}: {e}")
             return None
             
     async def periodic_update(self, bot_instance):
@@ -701,17 +897,14 @@ class RouteCache:
                     # Update the bot's cached data
                     if updated_cache:
                         bot_instance.route_cache_data = updated_cache
+                        bot_instance.response_cache.clear()
                         logger.info(f"Successfully updated route cache with {len(updated_cache)} routes")
                 except Exception as e:
-                    logger.error(f"Error during periodic cache update: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
+                    logger.exception(f"Error during periodic cache update: {e}")
         except asyncio.CancelledError:
             logger.info("Periodic update task cancelled")
         except Exception as e:
-            logger.error(f"Unexpected error in periodic update task: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Unexpected error in periodic update task: {e}")
             
     async def force_refresh(self):
         """
@@ -725,15 +918,13 @@ class RouteCache:
             new_cache = await self.cache_route_details()
             
             # Save cache to file
-            with open(self.CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(new_cache, f, indent=2)
+            with open(self.CACHE_FILE, 'wb') as f:
+                f.write(orjson.dumps(new_cache, option=orjson.OPT_INDENT_2))
             logger.info(f"Successfully force refreshed cache with {len(new_cache)} routes")
             
             return new_cache
         except Exception as e:
-            logger.error(f"Error during force refresh: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error during force refresh: {e}")
             return {}
 
 
@@ -741,6 +932,9 @@ class RouteCache:
 # Main Bot Class Definition
 # ==========================================
 
+class RateLimitExceeded(Exception):
+    """Raised when a command is rejected by the per-user or global rate limit"""
+
 class ZwiftBot(discord.Client):
     """
     Main Discord bot class for handling Zwift route information and commands.
@@ -759,15 +953,37 @@ class ZwiftBot(discord.Client):
         
         
         # Rate limiting system
-        self.command_cooldowns = {}  # User-specific cooldowns
-        self.global_command_times = deque(maxlen=50)  # Track recent commands
-        self.rate_limit_lock = asyncio.Lock()  # Lock for rate limit checking
+        self.command_cooldowns = OrderedDict()  # User-specific cooldowns, oldest first
         self.USER_COOLDOWN = 5.0  # Seconds between commands for a single user
         self.GLOBAL_RATE_LIMIT = 20  # Max commands per minute
+        self.global_tokens = float(self.GLOBAL_RATE_LIMIT)  # Global token bucket, refilled continuously
+        self.global_last_refill = time.monotonic()
         
-        # Initialize cache with a path that works in both Docker and local environments
-        import tempfile
+        # Short-lived cache of /route responses keyed on (user ID, normalized query)
+        self.response_cache = OrderedDict()
+        self.RESPONSE_CACHE_TTL = 60.0  # Seconds a cached response stays valid
+        self.RESPONSE_CACHE_SIZE = 1024  # Max cached responses before evicting the oldest
+        
+        # Image directory indexes keyed on (path, extensions), invalidated by the mtimes of their directories
+        self.image_dir_cache = {}
+        self.IMAGE_DIR_CHECK_INTERVAL = 300.0  # Seconds before a directory's mtime is checked again
+        
+        # Images found per official route name, cleared whenever a listing changes
+        self.route_image_cache = {}
+        
+        # Route image directories by image type, located in setup_hook
+        self.image_dirs = None
+        
+        # Dedicated workers for image lookups so they neither block the event loop
+        # nor compete with other users of the default executor
+        self.image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="route-images")
+        self.image_lock = threading.Lock()  # Guards image_dir_cache and route_image_cache
+        
+        # HTTP session shared by on-demand ZwiftInsider requests so connections
+        # are kept alive between them; created in setup_hook inside the event loop
+        self.http_session = None
         
+        # Initialize cache with a path that works in both Docker and local environments
         cache_path = "/app/data"  # Default for Docker
         
         # Check if the default path is writable, if not use a fallback
@@ -795,6 +1011,13 @@ class ZwiftBot(discord.Client):
         
         # Sync the command tree
         await self.tree.sync()
+        
+        # Open the shared HTTP session
+        self.http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+
+        # Locate the route image directories once and match every route to its images
+        self.image_dirs = self.discover_image_dirs()
+        await asyncio.get_running_loop().run_in_executor(self.image_executor, self.warm_route_images)
 
         # Initialize route cache
         logger.info("Initializing route cache...")
@@ -805,6 +1028,13 @@ class ZwiftBot(discord.Client):
         # Start background cache update task
         self.bg_task = self.loop.create_task(self.cache.periodic_update(self))
     
+    async def close(self):
+        """Shut down the image workers and the shared HTTP session along with the bot"""
+        self.image_executor.shutdown(wait=False, cancel_futures=True)
+        if self.http_session:
+            await self.http_session.close()
+        await super().close()
+    
     async def register_commands(self):
         """Register all bot commands with the command tree"""
         
@@ -841,35 +1071,44 @@ class ZwiftBot(discord.Client):
             user_id: The ID of the user making the request
             
         Raises:
-            HTTPException: If the rate limit is exceeded
+            RateLimitExceeded: If the rate limit is exceeded
         """
-        async with self.rate_limit_lock:
-            now = time.time()
-            
-            # Check user-specific cooldown
-            if user_id in self.command_cooldowns:
-                time_since_last = now - self.command_cooldowns[user_id]
-                if time_since_last < self.USER_COOLDOWN:
-                    wait_time = self.USER_COOLDOWN - time_since_last
-                    raise HTTPException(
-                        response=discord.WebhookMessage, 
-                        message=f"Please wait {wait_time:.1f} seconds before trying again."
-                    )
-            
-            # Update user's last command time
-            self.command_cooldowns[user_id] = now
-            
-            # Check global rate limit
-            self.global_command_times.append(now)
-            if len(self.global_command_times) >= self.GLOBAL_RATE_LIMIT:
-                oldest = self.global_command_times[0]
-                time_window = now - oldest
-                if time_window < 60:  # If more than GLOBAL_RATE_LIMIT commands in less than 60 seconds
-                    wait_time = 60 - time_window
-                    raise HTTPException(
-                        response=discord.WebhookMessage, 
-                        message=f"Bot is experiencing high traffic. Please try again in {wait_time:.1f} seconds."
-                    )
+        now = time.monotonic()
+        
+        # Check user-specific cooldown; this needs no lock as nothing is
+        # awaited between reading and updating the user's entry
+        last_used = self.command_cooldowns.get(user_id)
+        if last_used is not None:
+            time_since_last = now - last_used
+            if time_since_last < self.USER_COOLDOWN:
+                wait_time = self.USER_COOLDOWN - time_since_last
+                raise RateLimitExceeded(f"Please wait {wait_time:.1f} seconds before trying again.")
+        
+        # Update user's last command time
+        self.command_cooldowns[user_id] = now
+        self.command_cooldowns.move_to_end(user_id)
+        
+        # Drop expired cooldowns; entries are ordered by last use, so
+        # expired ones are always at the front
+        while self.command_cooldowns:
+            oldest_used = next(iter(self.command_cooldowns.values()))
+            if now - oldest_used < self.USER_COOLDOWN:
+                break
+            self.command_cooldowns.popitem(last=False)
+        
+        # Check global rate limit with a token bucket that refills
+        # GLOBAL_RATE_LIMIT tokens per minute; like the cooldown check,
+        # nothing is awaited so no lock is needed
+        refill_rate = self.GLOBAL_RATE_LIMIT / 60
+        self.global_tokens = min(
+            self.GLOBAL_RATE_LIMIT,
+            self.global_tokens + (now - self.global_last_refill) * refill_rate
+        )
+        self.global_last_refill = now
+        if self.global_tokens < 1:
+            wait_time = (1 - self.global_tokens) / refill_rate
+            raise RateLimitExceeded(f"Bot is experiencing high traffic. Please try again in {wait_time:.1f} seconds.")
+        self.global_tokens -= 1
 # ==========================================
 # ==========================================
 # Route Command Implementation
@@ -890,15 +1129,19 @@ class ZwiftBot(discord.Client):
             return
         
         try:
+            # Defer the response straight away; refresh_route has already
+            # deferred when it calls this to show the refreshed route
+            try:
+                await interaction.response.defer(thinking=True)
+            except discord.InteractionResponded:
+                pass
+            
             logger.info(f"Route command started for: {name}")
-        
-            # Defer the response
-            await interaction.response.defer(thinking=True)
                     
             # Check rate limits
             try:
                 await self.check_rate_limit(interaction.user.id)
-            except HTTPException as e:
+            except RateLimitExceeded as e:
                 logger.warning(f"Rate limit hit: {e}")
                 await interaction.followup.send(
                     embed=discord.Embed(
@@ -910,6 +1153,16 @@ class ZwiftBot(discord.Client):
                 )
                 return
             
+            # Reuse the response if this user just ran the same query
+            cache_key = (interaction.user.id, normalize_route_name(name))
+            cached = self.get_cached_response(cache_key)
+            if cached:
+                route_name, embed_dicts, existing_images = cached
+                logger.info(f"Serving cached response for: {route_name}")
+                embeds = [discord.Embed.from_dict(data) for data in embed_dicts]
+                await self.send_route_response(interaction, route_name, embeds, existing_images)
+                return
+            
             # Find route
             result, alternatives = find_route(name)
             logger.info(f"Route search result: {result['Route'] if result else 'Not found'}")
@@ -919,7 +1172,7 @@ class ZwiftBot(discord.Client):
                 embed = discord.Embed(
                     title=f"🚲 {result['Route']}",
                     url=result["URL"],
-                    color=0xFC6719
+                    color=EMBED_COLOR
                 )
                 
                 # Get route world
@@ -972,119 +1225,11 @@ class ZwiftBot(discord.Client):
                             inline=True
                         )
                 
-                # Prepare route name variations for smarter image matching
-                route_name = result['Route']
-                route_name_lower = route_name.lower()
-                route_variations = [
-                    route_name_lower.replace(' ', '_').replace("'", '').replace('-', '_'),
-                    route_name_lower.replace(' ', '').replace("'", '').replace('-', ''),
-                    route_name_lower.replace(' ', '-').replace("'", ''),
-                    ''.join(c for c in route_name_lower if c.isalnum())
-                ]
-                
-                logger.info(f"Looking for images with variations: {route_variations}")
-                
-                # Try both absolute and relative paths
-                base_paths = [
-                    "/app/route_images",
-                    "route_images",
-                    "/home/micah-reeves/Desktop/zwift-route-bot/route_images"
-                ]
-                
-                # Find valid base path
-                valid_base = None
-                for base in base_paths:
-                    if os.path.exists(base) and os.path.isdir(base):
-                        valid_base = base
-                        logger.info(f"Found valid base path: {valid_base}")
-                        break
-                
-                # Define image types to look for
-                image_types = {
-                    "Profile": "profiles",
-                    "Incline": "inclines", 
-                    "Map": "maps"
-                }
-                
-                # Find images with improved validation
-                existing_images = {}
-                if valid_base:
-                    for img_type, subdir in image_types.items():
-                        subdir_path = os.path.join(valid_base, subdir)
-                        
-                        if not os.path.exists(subdir_path) or not os.path.isdir(subdir_path):
-                            logger.warning(f"Directory not found: {subdir_path}")
-                            continue
-                            
-                        # Try exact matches with all name variations
-                        found = False
-                        for variation in route_variations:
-                            img_path = os.path.join(subdir_path, f"{variation}.png")
-                            if os.path.exists(img_path):
-                                existing_images[img_type] = img_path
-                                logger.info(f"Found {img_type} image: {img_path}")
-                                found = True
-                                break
-                        
-                        # If no exact match, try fuzzy matching with directory listing
-                        if not found:
-                            try:
-                                files = [f for f in os.listdir(subdir_path) if f.lower().endswith('.png')]
-                                
-                                # Strip extensions for matching
-                                file_bases = [os.path.splitext(f)[0].lower() for f in files]
-                                
-                                # Try difflib for fuzzy matching with higher threshold
-                                for variation in route_variations:
-                                    close_matches = get_close_matches(variation, file_bases, n=1, cutoff=0.8)  # Increased from 0.6 to 0.8
-                                    
-                                    if close_matches:
-                                        match_index = file_bases.index(close_matches[0])
-                                        matched_file = files[match_index]
-                                        img_path = os.path.join(subdir_path, matched_file)
-                                        
-                                        # Validate the match
-                                        if self.validate_route_image(img_path, route_name):
-                                            existing_images[img_type] = img_path
-                                            logger.info(f"Found and validated fuzzy match for {img_type}: {matched_file}")
-                                            found = True
-                                            break
-                                        else:
-                                            logger.info(f"Found but rejected fuzzy match for {img_type}: {matched_file} (failed validation)")
-                                
-                                # Special handling for maps directory which has different naming patterns
-                                if not found and subdir == "maps":
-                                    # For maps, try more strict keyword matching
-                                    # Use longer keywords to reduce false matches
-                                    route_keywords = [word for word in route_name_lower.split() if len(word) > 3]
-                                    
-                                    # If we don't have any long keywords, fall back to all keywords
-                                    if not route_keywords:
-                                        route_keywords = route_name_lower.split()
-                                    
-                                    # Look for files that contain at least 2 keywords (if possible)
-                                    min_keywords = min(2, len(route_keywords))
-                                    
-                                    for file in files:
-                                        file_lower = file.lower()
-                                        # Count how many keywords match
-                                        matching_keywords = sum(1 for keyword in route_keywords if keyword in file_lower)
-                                        
-                                        if matching_keywords >= min_keywords:
-                                            img_path = os.path.join(subdir_path, file)
-                                            
-                                            # Double-check with the validation function
-                                            if self.validate_route_image(img_path, route_name):
-                                                existing_images[img_type] = img_path
-                                                logger.info(f"Found strict keyword match for {img_type}: {file} ({matching_keywords} keywords)")
-                                                found = True
-                                                break
-                                
-                                # Log available files if no match found
-                                if not found:
-                                    logger.info(f"No match found for {img_type}. Available files: {files[:5]}...")
-                            except Exception as e:
-                                logger.error(f"Error listing directory {subdir_path}: {e}")
+                # Find the profile, incline and map images for this route
+                # in a worker thread so directory scans don't block the event loop
+                existing_images = await asyncio.get_running_loop().run_in_executor(
+                    self.image_executor, self.find_route_images, result['Route']
+                )
                 
                 # Add a description with available resources
                 description_parts = []
@@ -1096,10 +1241,7 @@ class ZwiftBot(discord.Client):
                 if 'VeloViewerURL' in result:
                     description_parts.append(f"View on [VeloViewer]({result['VeloViewerURL']})")
 
-                # Format route name for Cyccal URL
-                cyccal_route_name = result['Route'].lower().replace(' ', '-')
-                cyccal_url = f"https://cyccal.com/{cyccal_route_name}/"
-                description_parts.append(f"Check [Cyccal]({cyccal_url}) for additional INFO")
+                description_parts.append(f"Check [Cyccal]({result['_cyccal_url']}) for additional INFO")
                 
                 if existing_images:
                     description_parts.append(f"**{len(existing_images)} route images available below**")
@@ -1109,61 +1251,40 @@ class ZwiftBot(discord.Client):
                 embed.description = "\n".join(description_parts)
                 
                 # Add thumbnail
-                embed.set_thumbnail(url="https://zwiftinsider.com/wp-content/uploads/2022/12/zwift-logo.png")
+                embed.set_thumbnail(url=EMBED_THUMBNAIL_URL)
                 
-                # Send the initial embed with route details
-                await interaction.followup.send(embed=embed)
-                
-                # Send each image as a separate message with a descriptive embed
-                for image_name, image_path in existing_images.items():
-                    try:
-                        logger.info(f"Preparing to send {image_name} image from {image_path}")
-                        
-                        img_embed = discord.Embed(
-                            title=f"{result['Route']} - {image_name}",
-                            color=0xFC6719
-                        )
-                        
-                        # Use a simple filename for Discord attachment
-                        simple_filename = f"{image_name.lower()}.png"
-                        
-                        # Create file object and set image
-                        file = discord.File(image_path, filename=simple_filename)
-                        img_embed.set_image(url=f"attachment://{simple_filename}")
-                        
-                        # Send with attachment
-                        await interaction.followup.send(embed=img_embed, file=file)
-                        logger.info(f"Successfully sent {image_name} image")
-                    except Exception as img_error:
-                        logger.error(f"Error sending {image_name} image: {img_error}")
-                        import traceback
-                        logger.error(traceback.format_exc())
+                embeds = [embed]
                 
                 # Add a note about alternatives if any
                 if alternatives:
-                    alt_text = "\n".join(f"• {r['Route']}" for r in alternatives)
+                    alt_text = "\n".join(r['_display'] for r in alternatives)
                     alt_embed = discord.Embed(
                         title="Similar Routes",
                         description=f"You might also be interested in:\n{alt_text}",
-                        color=0xFC6719
+                        color=EMBED_COLOR
                     )
-                    await interaction.followup.send(embed=alt_embed)
+                    embeds.append(alt_embed)
+                
+                self.store_cached_response(
+                    cache_key,
+                    (result['Route'], [e.to_dict() for e in embeds], existing_images)
+                )
+                
+                await self.send_route_response(interaction, result['Route'], embeds, existing_images)
             
             else:
                 # Route not found
-                suggestions = random.sample(zwift_routes, min(3, len(zwift_routes)))
+                suggestions = random.sample(zwift_routes, ROUTE_SUGGESTION_COUNT)
                 embed = discord.Embed(
                     title="❌ Route Not Found",
                     description=f"Could not find a route matching `{name}`.\n\n**Try these routes:**\n" + 
-                               "\n".join(f"• {r['Route']}" for r in suggestions),
+                               "\n".join(r['_display'] for r in suggestions),
                     color=discord.Color.red()
                 )
                 await interaction.followup.send(embed=embed)
                 
         except Exception as e:
-            logger.error(f"Error in route command: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error in route command: {e}")
             try:
                 await interaction.followup.send(
                     embed=discord.Embed(
@@ -1175,6 +1296,399 @@ class ZwiftBot(discord.Client):
             except Exception as err:
                 logger.error(f"Failed to send error message: {err}")
                 
+    async def send_route_response(self, interaction, route_name, embeds, existing_images):
+        """
+        Send the route details, images and alternatives as a single followup message.
+        
+        Args:
+            interaction: The Discord interaction object
+            route_name: The official name of the route
+            embeds: The route details embed, optionally followed by the alternatives embed
+            existing_images: Mapping of image type -> image path
+        """
+        # Opening the image files happens off the event loop as well
+        image_embeds, files = await asyncio.get_running_loop().run_in_executor(
+            self.image_executor, self.build_image_attachments, route_name, existing_images
+        )
+        
+        # Route details first, then its images, then any alternatives
+        try:
+            await interaction.followup.send(embeds=embeds[:1] + image_embeds + embeds[1:], files=files)
+        except discord.HTTPException as e:
+            if not files:
+                raise
+            # An attachment was rejected (e.g. too large); still deliver the route details
+            logger.warning(f"Sending route images failed, sending details only: {e}")
+            await interaction.followup.send(embeds=embeds)
+            return
+        finally:
+            # Release the file handles even if sending failed
+            for file in files:
+                file.close()
+        logger.info(f"Sent route response with {len(files)} images")
+    
+    def build_image_attachments(self, route_name, existing_images):
+        """
+        Create the embeds and file attachments for a route's images.
+        
+        Args:
+            route_name: The official name of the route
+            existing_images: Mapping of image type -> image path
+            
+        Returns:
+            tuple: (embeds, files) ready to be sent in one message
+        """
+        embeds = []
+        files = []
+        for image_name, image_path in existing_images.items():
+            try:
+                logger.info(f"Preparing to send {image_name} image from {image_path}")
+                
+                img_embed = discord.Embed(
+                    title=f"{route_name} - {image_name}",
+                    color=EMBED_COLOR
+                )
+                
+                # Use a simple filename for Discord attachment, keeping the real
+                # extension so Discord renders the image with the right type
+                extension = os.path.splitext(image_path)[1].lower()
+                simple_filename = f"{image_name.lower()}{extension}"
+                
+                # Create file object from the cached image data and set image
+                image_data = io.BytesIO(load_image_bytes(image_path))
+                files.append(discord.File(image_data, filename=simple_filename))
+                img_embed.set_image(url=f"attachment://{simple_filename}")
+                embeds.append(img_embed)
+            except Exception as img_error:
+                logger.exception(f"Error preparing {image_name} image: {img_error}")
+        return embeds, files
+    
+    def get_cached_response(self, cache_key):
+        """
+        Look up a recent /route response.
+        
+        Args:
+            cache_key: Tuple of (user ID, normalized query)
+            
+        Returns:
+            The cached (route_name, embed_dicts, existing_images) tuple, or None if missing or expired
+        """
+        entry = self.response_cache.get(cache_key)
+        if not entry:
+            return None
+        
+        stored_at, response = entry
+        if time.monotonic() - stored_at >= self.RESPONSE_CACHE_TTL:
+            del self.response_cache[cache_key]
+            return None
+        return response
+    
+    def store_cached_response(self, cache_key, response):
+        """
+        Remember a /route response, evicting the oldest entries past the size limit.
+        
+        Args:
+            cache_key: Tuple of (user ID, normalized query)
+            response: Tuple of (route_name, embed_dicts, existing_images)
+        """
+        self.response_cache[cache_key] = (time.monotonic(), response)
+        self.response_cache.move_to_end(cache_key)
+        while len(self.response_cache) > self.RESPONSE_CACHE_SIZE:
+            self.response_cache.popitem(last=False)
+    
+    def warm_route_images(self):
+        """Match every known route to its images up front so /route only does lookups"""
+        start_time = time.time()
+        with_images = sum(1 for route in zwift_routes if self.find_route_images(route["Route"]))
+        logger.info(f"Matched images for {with_images}/{len(zwift_routes)} routes in {time.time() - start_time:.2f} seconds")
+    
+    def discover_image_dirs(self):
+        """
+        Locate the route image directories.
+        
+        Returns:
+            dict: Mapping of image type -> (subdirectory name, directory path)
+        """
+        # Find valid base path
+        valid_base = next((base for base in IMAGE_BASE_PATHS if os.path.isdir(base)), None)
+        if not valid_base:
+            logger.warning("No route image directory found")
+            return {}
+        logger.info(f"Found valid base path: {valid_base}")
+        
+        image_dirs = {}
+        for img_type, subdir in IMAGE_TYPES.items():
+            subdir_path = os.path.join(valid_base, subdir)
+            if not os.path.isdir(subdir_path):
+                logger.warning(f"Directory not found: {subdir_path}")
+                continue
+            image_dirs[img_type] = (subdir, subdir_path)
+        return image_dirs
+    
+    def find_route_images(self, route_name):
+        """
+        Find the local profile, incline and map images for a route.
+        Results are remembered per route until an image directory changes.
+        Safe to call from several image worker threads at once.
+        
+        Args:
+            route_name: The official name of the route
+            
+        Returns:
+            dict: Mapping of image type -> image path
+        """
+        # Only one worker at a time may refresh the listings and record results,
+        # so a result computed from an old listing cannot outlive its rebuild
+        with self.image_lock:
+            # Image directories are normally located once in setup_hook
+            if self.image_dirs is None:
+                self.image_dirs = self.discover_image_dirs()
+            
+            # Refresh the directory listings first; a changed directory clears
+            # the remembered per-route results
+            listings = {}
+            for img_type, (subdir, subdir_path) in self.image_dirs.items():
+                try:
+                    listings[img_type] = (subdir, subdir_path, self.get_image_index(subdir_path))
+                except Exception as e:
+                    logger.error(f"Error listing directory {subdir_path}: {e}")
+            
+            if route_name in self.route_image_cache:
+                return self.route_image_cache[route_name]
+            
+            # Prepare route name variations for smarter image matching
+            route_name_lower = route_name.lower()
+            if route_name_lower.isascii():
+                alnum_only = route_name_lower.translate(ALNUM_ONLY_TABLE)
+            else:
+                # The table only covers ASCII, so names like Champs-Élysées take the per-character path
+                alnum_only = ''.join(c for c in route_name_lower if c.isalnum())
+            route_variations = [
+                route_name_lower.replace(' ', '_').replace("'", '').replace('-', '_'),
+                route_name_lower.replace(' ', '').replace("'", '').replace('-', ''),
+                route_name_lower.replace(' ', '-').replace("'", ''),
+                alnum_only
+            ]
+            
+            logger.debug(f"Looking for images with variations: {route_variations}")
+            
+            # Find images with improved validation
+            existing_images = {}
+            for img_type, (subdir, subdir_path, image_index) in listings.items():
+                image_files = image_index['files']
+                file_bases = image_index['bases']
+                
+                # Try exact matches with all name variations
+                found = False
+                for variation in route_variations:
+                    matched_file = image_index['by_base'].get(variation)
+                    if matched_file:
+                        img_path = os.path.join(subdir_path, matched_file)
+                        existing_images[img_type] = img_path
+                        logger.debug(f"Found {img_type} image: {img_path}")
+                        found = True
+                        break
+                
+                if found:
+                    continue
+                
+                # If no exact match, try fuzzy matching with the directory listing
+                # Try fuzzy matching with higher threshold, best match per variation in order
+                for match_index in self.fuzzy_match_positions(route_variations, file_bases):
+                    if match_index is not None:
+                        matched_file = image_files[match_index][0]
+                        img_path = os.path.join(subdir_path, matched_file)
+                        
+                        # Validate the match
+                        if self.validate_route_image(img_path, route_name):
+                            existing_images[img_type] = img_path
+                            logger.debug(f"Found and validated fuzzy match for {img_type}: {matched_file}")
+                            found = True
+                            break
+                        else:
+                            logger.debug(f"Found but rejected fuzzy match for {img_type}: {matched_file} (failed validation)")
+                
+                # Special handling for maps directory which has different naming patterns
+                if not found and subdir == "maps":
+                    # For maps, try more strict keyword matching
+                    # Use longer keywords to reduce false matches
+                    route_keywords = [word for word in route_name_lower.split() if len(word) > 3]
+                    
+                    # If we don't have any long keywords, fall back to all keywords
+                    if not route_keywords:
+                        route_keywords = route_name_lower.split()
+                    
+                    # Look for files that contain at least 2 keywords (if possible)
+                    min_keywords = min(2, len(route_keywords))
+                    
+                    # Count how many keywords each file contains
+                    keyword_counts = Counter()
+                    for keyword in route_keywords:
+                        keyword_counts.update(self.get_keyword_hits(image_index, keyword))
+                    
+                    for position in sorted(keyword_counts):
+                        matching_keywords = keyword_counts[position]
+                        
+                        if matching_keywords >= min_keywords:
+                            file = image_files[position][0]
+                            img_path = os.path.join(subdir_path, file)
+                            
+                            # Double-check with the validation function
+                            if self.validate_route_image(img_path, route_name):
+                                existing_images[img_type] = img_path
+                                logger.debug(f"Found strict keyword match for {img_type}: {file} ({matching_keywords} keywords)")
+                                found = True
+                                break
+                
+                # Log available files if no match found
+                if not found:
+                    logger.debug(f"No match found for {img_type}. Available files: {[file for file, _ in image_files[:5]]}...")
+            
+            self.route_image_cache[route_name] = existing_images
+            return existing_images
+    
+    def get_image_index(self, dir_path, extensions=IMAGE_EXTENSIONS):
+        """
+        Index the image files below a directory, reusing the previous index
+        until the modification time of the directory or any subdirectory
+        changes. Modification times are only rechecked every
+        IMAGE_DIR_CHECK_INTERVAL seconds.
+        
+        Args:
+            dir_path: Directory to index
+            extensions: Lowercase file extensions to include
+            
+        Returns:
+            dict: Index with keys
+                files: (path relative to dir_path, lowercase filename) tuples
+                bases: Lowercase filenames without extension, parallel to files
+                by_base: Lowercase base name -> filename
+                keyword_hits: Keyword -> positions of files containing it, filled on demand
+        """
+        cache_key = (dir_path, extensions)
+        now = time.monotonic()
+        cached = self.image_dir_cache.get(cache_key)
+        if cached and now - cached[1] < self.IMAGE_DIR_CHECK_INTERVAL:
+            return cached[2]
+        
+        if cached and self.image_dirs_unchanged(cached[0]):
+            self.image_dir_cache[cache_key] = (cached[0], now, cached[2])
+            return cached[2]
+        
+        dir_mtimes = {}
+        image_files = list(self.scan_image_files(dir_path, extensions, dir_mtimes))
+        
+        file_bases = [os.path.splitext(file_lower)[0] for _, file_lower in image_files]
+        
+        # Exact lookups by base name; the first file with a given base wins
+        by_base = {}
+        for (file, _), base in zip(image_files, file_bases):
+            by_base.setdefault(base, file)
+        
+        image_index = {
+            'files': image_files,
+            'bases': file_bases,
+            'by_base': by_base,
+            'keyword_hits': {},
+        }
+        self.image_dir_cache[cache_key] = (dir_mtimes, now, image_index)
+        logger.info(f"Indexed {len(image_files)} images in {dir_path}")
+        
+        # Images matched against the old listing may no longer be right
+        self.route_image_cache.clear()
+        load_image_bytes.cache_clear()
+        return image_index
+    
+    def image_dirs_unchanged(self, dir_mtimes):
+        """
+        Check whether any directory of a previous scan has been modified or removed.
+        
+        Args:
+            dir_mtimes: Directory path -> modification time, as recorded by scan_image_files
+            
+        Returns:
+            bool: True if every directory still exists with the same modification time
+        """
+        try:
+            return all(os.stat(path).st_mtime == mtime for path, mtime in dir_mtimes.items())
+        except OSError:
+            return False
+    
+    def scan_image_files(self, dir_path, extensions, dir_mtimes, relative_dir=''):
+        """
+        Recursively list the image files below a directory in one os.scandir pass per directory.
+        
+        Args:
+            dir_path: Directory to scan
+            extensions: Lowercase file extensions to include
+            dir_mtimes: Dict filled with the modification time of every directory scanned
+            relative_dir: Path of dir_path relative to the top-level directory being scanned
+            
+        Yields:
+            tuple: (path relative to the top-level directory, lowercase filename)
+        """
+        # Recorded before listing, so changes made during the scan are seen next time
+        dir_mtimes[dir_path] = os.stat(dir_path).st_mtime
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    try:
+                        yield from self.scan_image_files(entry.path, extensions, dir_mtimes, relative_path)
+                    except OSError as e:
+                        logger.warning(f"Skipping unreadable image directory {entry.path}: {e}")
+                    continue
+                name_lower = entry.name.lower()
+                if name_lower.endswith(extensions):
+                    yield relative_path, name_lower
+    
+    def fuzzy_match_positions(self, queries, choices, cutoff=80):
+        """
+        Find the best fuzzy match among the choices for each query.
+        With RapidFuzz, all queries are prefiltered in a single batched call
+        before difflib picks the best match among the remaining choices.
+        
+        Args:
+            queries: Strings to match
+            choices: Candidate strings
+            cutoff: Minimum similarity score (0-100) for a match
+            
+        Returns:
+            list: Position of the best choice for each query, or None when nothing reaches the cutoff
+        """
+        if not choices:
+            return [None] * len(queries)
+        
+        candidate_lists = [choices] * len(queries)
+        if RAPIDFUZZ_AVAILABLE:
+            # fuzz.ratio never scores below difflib's ratio, so this only drops choices difflib would reject
+            scores = process.cdist(queries, choices, scorer=fuzz.ratio, score_cutoff=cutoff, workers=-1)
+            candidate_lists = [[choices[i] for i in row.nonzero()[0]] for row in scores]
+        
+        positions = []
+        for query, candidates in zip(queries, candidate_lists):
+            close_matches = get_close_matches(query, candidates, n=1, cutoff=cutoff / 100)
+            positions.append(choices.index(close_matches[0]) if close_matches else None)
+        return positions
+    
+    def get_keyword_hits(self, image_index, keyword):
+        """
+        Get the positions of the files in an image index whose lowercase name contains a keyword.
+        Each keyword is only scanned for once per index.
+        
+        Args:
+            image_index: Index returned by get_image_index
+            keyword: Lowercase keyword to look for
+            
+        Returns:
+            set: Positions into image_index['files']
+        """
+        hits = image_index['keyword_hits'].get(keyword)
+        if hits is None:
+            hits = {i for i, (_, file_lower) in enumerate(image_index['files']) if keyword in file_lower}
+            image_index['keyword_hits'][keyword] = hits
+        return hits
+    
     def validate_route_image(self, image_path, route_name):
         """
         Validates that an image is likely for the correct route
@@ -1234,54 +1748,51 @@ class ZwiftBot(discord.Client):
                 )
                 return
                 
-            # Create a temporary session just for this request
-            async with aiohttp.ClientSession() as session:
-                logger.info(f"Refreshing data for route: {result['Route']}")
+            logger.info(f"Refreshing data for route: {result['Route']}")
+            
+            try:
+                # Fetch updated route details over the shared HTTP session
+                route_data = await self.cache.fetch_route_details(self.http_session, result)
                 
-                try:
-                    # Fetch updated route details
-                    route_data = await self.cache.fetch_route_details(session, result)
+                if route_data and 'route_name' in route_data:
+                    # Update the cache
+                    self.route_cache_data[result['Route']] = route_data
+                    self.response_cache.clear()
                     
-                    if route_data and 'route_name' in route_data:
-                        # Update the cache
-                        self.route_cache_data[result['Route']] = route_data
-                        
-                        # Save the updated cache
-                        with open(self.cache.CACHE_FILE, 'w', encoding='utf-8') as f:
-                            json.dump(self.route_cache_data, f, indent=2)
-                        
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="✅ Route Refreshed",
-                                description=f"Successfully refreshed data for '{result['Route']}'.",
-                                color=discord.Color.green()
-                            )
-                        )
-                    else:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="⚠️ Partial Refresh",
-                                description=f"Route was found but complete data couldn't be refreshed. Using existing data if available.",
-                                color=discord.Color.orange()
-                            )
+                    # Save the updated cache
+                    with open(self.cache.CACHE_FILE, 'wb') as f:
+                        f.write(orjson.dumps(self.route_cache_data, option=orjson.OPT_INDENT_2))
+                    
+                    await interaction.followup.send(
+                        embed=discord.Embed(
+                            title="✅ Route Refreshed",
+                            description=f"Successfully refreshed data for '{result['Route']}'.",
+                            color=discord.Color.green()
                         )
-                except Exception as e:
-                    logger.error(f"Error refreshing route {name}: {e}")
+                    )
+                else:
                     await interaction.followup.send(
                         embed=discord.Embed(
-                            title="❌ Refresh Error",
-                            description=f"An error occurred while refreshing the route data: {str(e)}",
-                            color=discord.Color.red()
+                            title="⚠️ Partial Refresh",
+                            description=f"Route was found but complete data couldn't be refreshed. Using existing data if available.",
+                            color=discord.Color.orange()
                         )
                     )
+            except Exception as e:
+                logger.error(f"Error refreshing route {name}: {e}")
+                await interaction.followup.send(
+                    embed=discord.Embed(
+                        title="❌ Refresh Error",
+                        description=f"An error occurred while refreshing the route data: {str(e)}",
+                        color=discord.Color.red()
+                    )
+                )
             
             # Now display the route with updated or existing data
             await self.route(interaction, name)
             
         except Exception as e:
-            logger.error(f"Error in refresh_route command: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error in refresh_route command: {e}")
             
             try:
                 await interaction.followup.send(
@@ -1335,6 +1846,7 @@ class ZwiftBot(discord.Client):
             if updated_cache:
                 # Update the bot's cached data
                 self.route_cache_data = updated_cache
+                self.response_cache.clear()
                 
                 # Send success message
                 await interaction.followup.send(
@@ -1355,9 +1867,7 @@ class ZwiftBot(discord.Client):
                 )
         
         except Exception as e:
-            logger.error(f"Error in refresh_all_routes command: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error in refresh_all_routes command: {e}")
             
             try:
                 await interaction.followup.send(
@@ -1375,13 +1885,20 @@ class ZwiftBot(discord.Client):
 # Main Program
 # ==========================================
 
-def main():
+def main(max_retries=5):
     """
     Main program loop with retry logic.
     Handles startup, retries, and graceful shutdown.
+    
+    Args:
+        max_retries: Number of start attempts before giving up
     """
     retries = 0
-    max_retries = 5
+    
+    # Use uvloop for the event loop discord.py creates, if installed
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+        logger.info("Using uvloop event loop")
     
     while retries < max_retries:
         try: